@@ -1,17 +1,22 @@
 'use client';
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaArrowLeft, FaEye } from 'react-icons/fa';
 import Card from '@/components/Card';
 import Button from '@/components/Button';
 import Loading from '@/components/Loading';
-import { orderAPI } from '@/lib/api';
+import { orderAPI, subscribeAdminEvents, mergeById } from '@/lib/api';
 import { isAuthenticated } from '@/lib/auth';
 
 export default function AdminOrders() {
   const router = useRouter();
   const [orders, setOrders] = useState([]);
   const [loading, setLoading] = useState(true);
+  // Rows seen on the event stream; they win over an older list response
+  const streamedOrders = useRef(new Map());
+  // Ref so the stream callbacks see the current choice when they refetch
+  const includeArchived = useRef(false);
+  const [showArchived, setShowArchived] = useState(false);
   const [selectedOrder, setSelectedOrder] = useState(null);
 
   useEffect(() => {
@@ -19,13 +24,37 @@ export default function AdminOrders() {
       router.push('/admin');
       return;
     }
-    fetchOrders();
+
+    // Load once the stream is open so no change falls between the two
+    // (or as soon as it fails, so the page still works without it).
+    let loaded = false;
+    const loadOnce = () => {
+      if (loaded) return;
+      loaded = true;
+      fetchOrders();
+    };
+
+    return subscribeAdminEvents({
+      'order.created': (order) => upsertOrder(order),
+      'order.status_changed': (order) => upsertOrder(order),
+      resync: () => {
+        streamedOrders.current.clear();
+        fetchOrders();
+      },
+    }, { onOpen: loadOnce, onError: loadOnce });
   }, []);
 
+  const upsertOrder = (order) => {
+    streamedOrders.current.set(order.id, order);
+    setOrders((current) => mergeById(current, [order]));
+  };
+
   const fetchOrders = async () => {
     try {
-      const response = await orderAPI.getAll();
-      setOrders(response.data);
+      const response = await orderAPI.getAll(
+        includeArchived.current ? { include_archived: true } : undefined
+      );
+      setOrders(mergeById(response.data, [...streamedOrders.current.values()]));
     } catch (error) {
       console.error('Error fetching orders:', error);
     } finally {
@@ -35,8 +64,8 @@ export default function AdminOrders() {
 
   const updateOrderStatus = async (orderId, status) => {
     try {
-      await orderAPI.update(orderId, { status });
-      fetchOrders();
+      const response = await orderAPI.update(orderId, { status });
+      upsertOrder(response.data);
       setSelectedOrder(null);
     } catch (error) {
       console.error('Error updating order:', error);
@@ -44,6 +73,12 @@ export default function AdminOrders() {
     }
   };
 
+  const toggleArchived = () => {
+    includeArchived.current = !includeArchived.current;
+    setShowArchived(includeArchived.current);
+    fetchOrders();
+  };
+
   if (loading) return <Loading />;
 
   return (
@@ -56,6 +91,9 @@ export default function AdminOrders() {
           <h1 className="text-4xl font-bold">
             Customer <span className="gradient-text">Orders</span>
           </h1>
+          <Button variant="ghost" className="ml-auto" onClick={toggleArchived}>
+            {showArchived ? 'Hide archived' : 'Show archived'}
+          </Button>
         </div>
 
         {orders.length === 0 ? (
@@ -80,6 +118,11 @@ export default function AdminOrders() {
                       }`}>
                         {order.status}
                       </span>
+                      {order.archived && (
+                        <span className="px-3 py-1 rounded-full text-sm font-semibold bg-gray-500/20 text-gray-400">
+                          archived
+                        </span>
+                      )}
                     </div>
 
                     <div className="grid grid-cols-1 md:grid-cols-2 gap-4 mb-4">
@@ -112,7 +155,7 @@ export default function AdminOrders() {
                       View
                     </Button>
                     
-                    {order.status === 'pending' && (
+                    {!order.archived && order.status === 'pending' && (
                       <Button
                         variant="primary"
                         onClick={() => updateOrderStatus(order.id, 'processing')}
@@ -121,7 +164,7 @@ export default function AdminOrders() {
                       </Button>
                     )}
                     
-                    {order.status === 'processing' && (
+                    {!order.archived && order.status === 'processing' && (
                       <Button
                         variant="primary"
                         onClick={() => updateOrderStatus(order.id, 'completed')}
@@ -1,30 +1,59 @@
 'use client';
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaArrowLeft } from 'react-icons/fa';
 import Card from '@/components/Card';
 import Button from '@/components/Button';
 import Loading from '@/components/Loading';
-import { customRequestAPI } from '@/lib/api';
+import { customRequestAPI, subscribeAdminEvents, mergeById } from '@/lib/api';
 import { isAuthenticated } from '@/lib/auth';
 
 export default function AdminRequests() {
   const router = useRouter();
   const [requests, setRequests] = useState([]);
   const [loading, setLoading] = useState(true);
+  // Rows seen on the event stream; they win over an older list response
+  const streamedRequests = useRef(new Map());
+  // Ref so the stream callbacks see the current choice when they refetch
+  const includeArchived = useRef(false);
+  const [showArchived, setShowArchived] = useState(false);
 
   useEffect(() => {
     if (!isAuthenticated()) {
       router.push('/admin');
       return;
     }
-    fetchRequests();
+
+    // Load once the stream is open so no change falls between the two
+    // (or as soon as it fails, so the page still works without it).
+    let loaded = false;
+    const loadOnce = () => {
+      if (loaded) return;
+      loaded = true;
+      fetchRequests();
+    };
+
+    return subscribeAdminEvents({
+      'custom_request.created': (request) => upsertRequest(request),
+      'custom_request.status_changed': (request) => upsertRequest(request),
+      resync: () => {
+        streamedRequests.current.clear();
+        fetchRequests();
+      },
+    }, { onOpen: loadOnce, onError: loadOnce });
   }, []);
 
+  const upsertRequest = (request) => {
+    streamedRequests.current.set(request.id, request);
+    setRequests((current) => mergeById(current, [request]));
+  };
+
   const fetchRequests = async () => {
     try {
-      const response = await customRequestAPI.getAll();
-      setRequests(response.data);
+      const response = await customRequestAPI.getAll(
+        includeArchived.current ? { include_archived: true } : undefined
+      );
+      setRequests(mergeById(response.data, [...streamedRequests.current.values()]));
     } catch (error) {
       console.error('Error fetching requests:', error);
     } finally {
@@ -34,14 +63,20 @@ export default function AdminRequests() {
 
   const updateRequestStatus = async (requestId, status) => {
     try {
-      await customRequestAPI.update(requestId, { status });
-      fetchRequests();
+      const response = await customRequestAPI.update(requestId, { status });
+      upsertRequest(response.data);
     } catch (error) {
       console.error('Error updating request:', error);
       alert('Failed to update request status');
     }
   };
 
+  const toggleArchived = () => {
+    includeArchived.current = !includeArchived.current;
+    setShowArchived(includeArchived.current);
+    fetchRequests();
+  };
+
   if (loading) return <Loading />;
 
   return (
@@ -54,6 +89,9 @@ export default function AdminRequests() {
           <h1 className="text-4xl font-bold">
             Custom <span className="gradient-text">Requests</span>
           </h1>
+          <Button variant="ghost" className="ml-auto" onClick={toggleArchived}>
+            {showArchived ? 'Hide archived' : 'Show archived'}
+          </Button>
         </div>
 
         {requests.length === 0 ? (
@@ -78,6 +116,11 @@ export default function AdminRequests() {
                       }`}>
                         {request.status}
                       </span>
+                      {request.archived && (
+                        <span className="px-3 py-1 rounded-full text-sm font-semibold bg-gray-500/20 text-gray-400">
+                          archived
+                        </span>
+                      )}
                     </div>
 
                     <div className="grid grid-cols-1 md:grid-cols-3 gap-4 mb-4">
@@ -110,7 +153,7 @@ export default function AdminRequests() {
                   </div>
 
                   <div className="flex flex-col gap-2 ml-4">
-                    {request.status === 'pending' && (
+                    {!request.archived && request.status === 'pending' && (
                       <>
                         <Button
                           variant="primary"
@@ -128,7 +171,7 @@ export default function AdminRequests() {
                       </>
                     )}
                     
-                    {request.status === 'in_progress' && (
+                    {!request.archived && request.status === 'in_progress' && (
                       <Button
                         variant="primary"
                         onClick={() => updateRequestStatus(request.id, 'completed')}
@@ -35,7 +35,7 @@ export const productAPI = {
 
 // Order APIs
 export const orderAPI = {
-  getAll: () => api.get('/api/orders'),
+  getAll: (params) => api.get('/api/orders', { params }),
   getById: (id) => api.get(`/api/orders/${id}`),
   create: (data) => api.post('/api/orders', data),
   update: (id, data) => api.put(`/api/orders/${id}`, data),
@@ -43,7 +43,7 @@ export const orderAPI = {
 
 // Custom Request APIs
 export const customRequestAPI = {
-  getAll: () => api.get('/api/custom-requests'),
+  getAll: (params) => api.get('/api/custom-requests', { params }),
   create: (data) => api.post('/api/custom-requests', data),
   update: (id, data) => api.put(`/api/custom-requests/${id}`, data),
 };
@@ -70,4 +70,63 @@ export const uploadAPI = {
   delete: (filename) => api.delete(`/api/upload/${filename}`),
 };
 
+// Admin event stream
+// EventSource can't send headers, so each connection uses a short-lived
+// stream token in the query string. Reconnects are handled here (with a
+// fresh token) and resume from the last received event id.
+// onOpen runs on every (re)connect, onError whenever a connection fails.
+export const subscribeAdminEvents = (handlers, { onOpen, onError } = {}) => {
+  let source = null;
+  let lastEventId = null;
+  let retryTimer = null;
+  let stopped = false;
+
+  const reconnect = () => {
+    if (stopped) return;
+    if (onError) onError();
+    retryTimer = setTimeout(connect, 3000);
+  };
+
+  const connect = async () => {
+    try {
+      const response = await api.post('/api/admin/events/token');
+      if (stopped) return;
+      const params = new URLSearchParams({ token: response.data.token });
+      if (lastEventId) params.set('last_event_id', lastEventId);
+      source = new EventSource(`${API_URL}/api/admin/events?${params}`);
+      source.onopen = () => onOpen && onOpen();
+      Object.entries(handlers).forEach(([type, handler]) => {
+        source.addEventListener(type, (event) => {
+          lastEventId = event.lastEventId || lastEventId;
+          handler(JSON.parse(event.data));
+        });
+      });
+      source.onerror = () => {
+        source.close();
+        reconnect();
+      };
+    } catch (error) {
+      reconnect();
+    }
+  };
+
+  connect();
+  return () => {
+    stopped = true;
+    clearTimeout(retryTimer);
+    if (source) source.close();
+  };
+};
+
+// Apply rows received from the event stream to a list, replacing by id
+export const mergeById = (rows, updates) => {
+  const merged = [...rows];
+  updates.forEach((row) => {
+    const index = merged.findIndex((r) => r.id === row.id);
+    if (index === -1) merged.push(row);
+    else merged[index] = { ...merged[index], ...row };
+  });
+  return merged;
+};
+
 export default api;
@@ -1,5 +1,7 @@
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Request, Header, Query
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 from typing import List, Optional
@@ -9,21 +11,26 @@ import sys
 import shutil
 from pathlib import Path
 import json
+import asyncio
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import get_db, engine, Base
-from models import Product, Order, CustomRequest, PageContent, Admin
+from models import Product, Order, CustomRequest, PageContent, Admin, ArchivedOrder, ArchivedCustomRequest
 import schemas
 from auth import (
     authenticate_admin, 
     create_access_token, 
     get_current_admin, 
+    get_current_admin_stream,
+    create_event_stream_token,
     init_admin,
     get_password_hash
 )
 from config import get_settings
+from events import broadcaster, format_sse, parse_last_event_id
+from archive import query_with_archive, get_with_archive
 
 settings = get_settings()
 
@@ -200,9 +207,12 @@ async def delete_product(
 async def get_orders(
     skip: int = 0,
     limit: int = 100,
+    include_archived: bool = False,
     db: Session = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin)
 ):
+    if include_archived:
+        return query_with_archive(db, Order, ArchivedOrder, skip, limit)
     orders = db.query(Order).offset(skip).limit(limit).all()
     return orders
 
@@ -210,10 +220,14 @@ async def get_orders(
 @app.get("/api/orders/{order_id}", response_model=schemas.Order)
 async def get_order(
     order_id: int,
+    include_archived: bool = False,
     db: Session = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin)
 ):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    if include_archived:
+        order = get_with_archive(db, Order, ArchivedOrder, order_id)
+    else:
+        order = db.query(Order).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -225,6 +239,7 @@ async def create_order(order: schemas.OrderCreate, db: Session = Depends(get_db)
     db.add(db_order)
     db.commit()
     db.refresh(db_order)
+    broadcaster.publish("order.created", jsonable_encoder(schemas.Order.model_validate(db_order)))
     return db_order
 
 
@@ -239,11 +254,17 @@ async def update_order(
     if not db_order:
         raise HTTPException(status_code=404, detail="Order not found")
     
+    previous_status = db_order.status
     for key, value in order.dict(exclude_unset=True).items():
         setattr(db_order, key, value)
     
     db.commit()
     db.refresh(db_order)
+    if db_order.status != previous_status:
+        broadcaster.publish("order.status_changed", {
+            **jsonable_encoder(schemas.Order.model_validate(db_order)),
+            "previous_status": previous_status,
+        })
     return db_order
 
 
@@ -253,9 +274,12 @@ async def update_order(
 async def get_custom_requests(
     skip: int = 0,
     limit: int = 100,
+    include_archived: bool = False,
     db: Session = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin)
 ):
+    if include_archived:
+        return query_with_archive(db, CustomRequest, ArchivedCustomRequest, skip, limit)
     requests = db.query(CustomRequest).offset(skip).limit(limit).all()
     return requests
 
@@ -269,6 +293,7 @@ async def create_custom_request(
     db.add(db_request)
     db.commit()
     db.refresh(db_request)
+    broadcaster.publish("custom_request.created", jsonable_encoder(schemas.CustomRequest.model_validate(db_request)))
     return db_request
 
 
@@ -283,14 +308,75 @@ async def update_custom_request(
     if not db_request:
         raise HTTPException(status_code=404, detail="Custom request not found")
     
+    previous_status = db_request.status
     for key, value in request.dict(exclude_unset=True).items():
         setattr(db_request, key, value)
     
     db.commit()
     db.refresh(db_request)
+    if db_request.status != previous_status:
+        broadcaster.publish("custom_request.status_changed", {
+            **jsonable_encoder(schemas.CustomRequest.model_validate(db_request)),
+            "previous_status": previous_status,
+        })
     return db_request
 
 
+# ==================== ADMIN EVENT STREAM ====================
+
+@app.post("/api/admin/events/token", response_model=schemas.EventStreamToken)
+async def admin_events_token(current_admin: Admin = Depends(get_current_admin)):
+    """Issue a short-lived token for opening the event stream"""
+    return {
+        "token": create_event_stream_token(current_admin),
+        "expires_in": settings.event_token_expire_seconds,
+    }
+
+
+@app.get("/api/admin/events")
+async def admin_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    resume_from: Optional[str] = Query(None, alias="last_event_id"),
+    current_admin: Admin = Depends(get_current_admin_stream)
+):
+    """Server-sent events for new and updated orders and custom requests"""
+    # A fresh EventSource cannot send Last-Event-ID, so the client passes it
+    # in the query when it reconnects with a new stream token.
+    queue, backlog = broadcaster.subscribe(parse_last_event_id(last_event_id or resume_from))
+
+    async def stream():
+        # Streams are capped so credentials are re-checked on reconnect and
+        # no connection stays open indefinitely.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.event_stream_max_seconds
+        try:
+            for event in backlog:
+                yield format_sse(event)
+            while not await request.is_disconnected():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=min(settings.event_keepalive_seconds, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield format_sse(event)
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ==================== PAGE CONTENT ENDPOINTS ====================
 
 @app.get("/api/content/{page_key}", response_model=schemas.PageContent)
@@ -0,0 +1,241 @@
+"""Move closed orders and custom requests out of the hot tables.
+
+Completed and cancelled rows older than the retention window are copied to
+the *_archive tables and deleted from the hot tables in chunked transactions,
+so admin list queries and counts only scan live rows.
+
+Usage (from the server directory):
+    python archive.py [--days 90] [--batch-size 500] [--dry-run]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, MetaData, delete, func, insert, literal, select, text, union_all
+from sqlalchemy.orm import Session
+from database import SessionLocal, engine, Base
+from models import Order, CustomRequest, ArchivedOrder, ArchivedCustomRequest
+from config import get_settings
+
+settings = get_settings()
+
+ARCHIVABLE_STATUSES = ("completed", "cancelled")
+
+# (hot model, archive model) pairs handled by the job
+ARCHIVE_TABLES = [
+    (Order, ArchivedOrder),
+    (CustomRequest, ArchivedCustomRequest),
+]
+
+
+def _hot_columns(model):
+    return [column.name for column in model.__table__.columns]
+
+
+def _archivable(model, cutoff: datetime):
+    return (model.status.in_(ARCHIVABLE_STATUSES)) & (model.updated_at < cutoff)
+
+
+def count_archivable(db: Session, model, cutoff: datetime) -> int:
+    return db.scalar(select(func.count()).select_from(model).where(_archivable(model, cutoff)))
+
+
+def needs_autoincrement_rebuild(db: Session, model) -> bool:
+    """True for a SQLite hot table created before the archive existed.
+
+    Without AUTOINCREMENT SQLite hands out max(id) + 1, so once the newest
+    rows are archived new rows would reuse their ids.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return False
+    sql = db.scalar(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": model.__tablename__},
+    )
+    return sql is not None and "AUTOINCREMENT" not in sql.upper()
+
+
+def rebuild_with_autoincrement(db: Session, model, archive_model) -> int:
+    """Recreate a SQLite hot table with AUTOINCREMENT, keeping its rows.
+
+    The id sequence starts above every archived id. Rows that already reuse
+    an archived id get a fresh one. Returns the number of renumbered rows.
+    """
+    table = model.__table__
+    name = table.name
+    # Scratch metadata: the other tables are only there to resolve foreign keys
+    metadata = MetaData()
+    for other in table.metadata.sorted_tables:
+        if other is not table:
+            other.to_metadata(metadata)
+    rebuilt = table.to_metadata(metadata, name=f"{name}__rebuild")
+    names = ", ".join(_hot_columns(model))
+    data_names = ", ".join(column for column in _hot_columns(model) if column != "id")
+    archive_name = archive_model.__tablename__
+
+    db.execute(text(f"DROP TABLE IF EXISTS {rebuilt.name}"))
+    for index in table.indexes:
+        db.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    rebuilt.create(db.connection())
+    db.execute(text(
+        f"INSERT INTO {rebuilt.name} ({names}) SELECT {names} FROM {name} "
+        f"WHERE id NOT IN (SELECT id FROM {archive_name})"
+    ))
+    last_id = max(
+        db.scalar(text(f"SELECT max(id) FROM {name}")) or 0,
+        db.scalar(text(f"SELECT max(id) FROM {archive_name}")) or 0,
+    )
+    db.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": rebuilt.name})
+    db.execute(
+        text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"),
+        {"name": rebuilt.name, "seq": last_id},
+    )
+    renumbered = db.execute(text(
+        f"INSERT INTO {rebuilt.name} ({data_names}) SELECT {data_names} FROM {name} "
+        f"WHERE id IN (SELECT id FROM {archive_name}) ORDER BY id"
+    )).rowcount
+    db.execute(text(f"DROP TABLE {name}"))
+    db.execute(text(f"ALTER TABLE {rebuilt.name} RENAME TO {name}"))
+    for index in rebuilt.indexes:
+        db.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    for index in table.indexes:
+        index.create(db.connection())
+    db.commit()
+    return renumbered
+
+
+def archive_rows(db: Session, model, archive_model, cutoff: datetime, batch_size: int) -> int:
+    """Move archivable rows in batches, committing after each one."""
+    if needs_autoincrement_rebuild(db, model):
+        raise RuntimeError(
+            f"{model.__tablename__} reuses archived ids; rebuild it with "
+            f"rebuild_with_autoincrement() (python archive.py does this) before archiving"
+        )
+    table = model.__table__
+    archive_table = archive_model.__table__
+    names = _hot_columns(model)
+    moved = 0
+    while True:
+        ids = db.scalars(
+            select(model.id).where(_archivable(model, cutoff)).order_by(model.id).limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        # Re-check the predicate on every statement: a row reopened through
+        # the API after the id select must stay in (or return to) the hot table.
+        batch = table.c.id.in_(ids)
+        archived_at = datetime.utcnow()
+        rows = select(
+            *[table.c[name] for name in names],
+            literal(archived_at, DateTime),
+        ).where(batch & _archivable(model, cutoff))
+        db.execute(insert(archive_table).from_select(names + ["archived_at"], rows))
+        result = db.execute(
+            delete(table).where(
+                batch
+                & _archivable(model, cutoff)
+                & table.c.id.in_(select(archive_table.c.id).where(archive_table.c.archived_at == archived_at))
+            )
+        )
+        db.execute(
+            delete(archive_table).where(
+                (archive_table.c.archived_at == archived_at)
+                & archive_table.c.id.in_(select(table.c.id).where(batch))
+            )
+        )
+        db.commit()
+        moved += result.rowcount
+    return moved
+
+
+def query_with_archive(db: Session, model, archive_model, skip: int = 0, limit: int = 100):
+    """List rows from the hot table and its archive as one id-ordered page."""
+    names = _hot_columns(model)
+    hot = select(*[model.__table__.c[name] for name in names], literal(False).label("archived"))
+    cold = select(*[archive_model.__table__.c[name] for name in names], literal(True).label("archived"))
+    combined = union_all(hot, cold)
+    stmt = combined.order_by(combined.selected_columns.id).offset(skip).limit(limit)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def get_with_archive(db: Session, model, archive_model, row_id: int):
+    """Look a row up by id in the hot table, falling back to the archive."""
+    row = db.query(model).filter(model.id == row_id).first()
+    if row is None:
+        row = db.query(archive_model).filter(archive_model.id == row_id).first()
+    return row
+
+
+def _median_ms(query, runs: int, db: Session) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        query()
+        timings.append(time.perf_counter() - start)
+        db.expunge_all()  # each run loads fresh objects, like a new request
+    return round(statistics.median(timings) * 1000, 2)
+
+
+def measure_hot_table(db: Session, model, runs: int = 7) -> dict:
+    """Row count plus median timings of the admin list page and count queries.
+
+    One untimed warm-up pass runs first so the first timing does not carry
+    connection and cache warm-up cost.
+    """
+    def page():
+        return db.query(model).offset(0).limit(100).all()
+
+    def count():
+        return db.query(model).count()
+
+    page()
+    rows = count()
+    db.expunge_all()
+    return {
+        "rows": rows,
+        "page_ms": _median_ms(page, runs, db),
+        "count_ms": _median_ms(count, runs, db),
+    }
+
+
+def run_archival(retention_days: int, batch_size: int, dry_run: bool = False, runs: int = 7):
+    Base.metadata.create_all(bind=engine)
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    db = SessionLocal()
+    try:
+        for model, archive_model in ARCHIVE_TABLES:
+            name = model.__tablename__
+            if needs_autoincrement_rebuild(db, model):
+                if dry_run:
+                    print(f"{name}: table would be rebuilt with AUTOINCREMENT before archiving")
+                else:
+                    renumbered = rebuild_with_autoincrement(db, model, archive_model)
+                    print(f"{name}: rebuilt with AUTOINCREMENT so archived ids are not reused"
+                          + (f"; {renumbered} rows that reused an archived id got new ids" if renumbered else ""))
+            before = measure_hot_table(db, model, runs)
+            if dry_run:
+                print(f"{name}: {count_archivable(db, model, cutoff)} rows would be archived, "
+                      f"hot table {before['rows']} rows, "
+                      f"page query {before['page_ms']} ms, count {before['count_ms']} ms (median of {runs})")
+                continue
+            moved = archive_rows(db, model, archive_model, cutoff, batch_size)
+            after = measure_hot_table(db, model, runs)
+            print(f"{name}: archived {moved} rows; "
+                  f"hot table {before['rows']} -> {after['rows']} rows, "
+                  f"page query {before['page_ms']} -> {after['page_ms']} ms, "
+                  f"count {before['count_ms']} -> {after['count_ms']} ms (median of {runs})")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive closed orders and custom requests")
+    parser.add_argument("--days", type=int, default=settings.archive_retention_days,
+                        help="archive rows closed more than this many days ago")
+    parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size,
+                        help="rows moved per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be moved")
+    parser.add_argument("--runs", type=int, default=7,
+                        help="timed runs per query for the before/after latency (median reported)")
+    args = parser.parse_args()
+    run_archival(args.days, args.batch_size, args.dry_run, args.runs)
@@ -2,10 +2,10 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, SessionLocal
 from models import Admin
 from schemas import TokenData
 from config import get_settings
@@ -13,6 +13,10 @@ from config import get_settings
 settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+
+# Scope of the short-lived tokens that may only open the admin event stream
+EVENT_STREAM_SCOPE = "admin_events"
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -47,16 +51,31 @@ def authenticate_admin(db: Session, email: str, password: str):
     return admin
 
 
-async def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def create_event_stream_token(admin: Admin) -> str:
+    """Short-lived token for /api/admin/events.
+
+    It travels in the query string (EventSource cannot set headers) and so
+    ends up in access logs; it expires quickly and is rejected everywhere
+    else.
+    """
+    return create_access_token(
+        data={"sub": admin.email, "scope": EVENT_STREAM_SCOPE},
+        expires_delta=timedelta(seconds=settings.event_token_expire_seconds),
+    )
+
+
+def get_admin_from_token(token: Optional[str], db: Session, scope: Optional[str] = None):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if not token:
+        raise credentials_exception
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         email: str = payload.get("sub")
-        if email is None:
+        if email is None or payload.get("scope") != scope:
             raise credentials_exception
         token_data = TokenData(email=email)
     except JWTError:
@@ -68,6 +87,30 @@ async def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = D
     return admin
 
 
+async def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    return get_admin_from_token(token, db)
+
+
+async def get_current_admin_stream(
+    bearer: Optional[str] = Depends(oauth2_scheme_optional),
+    token: Optional[str] = Query(None),
+):
+    """Authenticate a long-lived stream request.
+
+    Accepts the regular admin JWT in the Authorization header, or a stream
+    token from create_event_stream_token() as ?token=. A short-lived session
+    is used so the stream does not hold a pooled connection open while it is
+    connected.
+    """
+    db = SessionLocal()
+    try:
+        if bearer:
+            return get_admin_from_token(bearer, db)
+        return get_admin_from_token(token, db, scope=EVENT_STREAM_SCOPE)
+    finally:
+        db.close()
+
+
 def init_admin(db: Session):
     """Initialize admin user if not exists"""
     admin = db.query(Admin).filter(Admin.email == settings.admin_email).first()
@@ -0,0 +1,474 @@
+"""Load and latency benchmark for the API.
+
+Seeds a database with realistic volumes, then drives api.main.app with a
+weighted mix of public reads, admin reads, order submissions, uploads and
+logins, either in-process through an ASGI client or over HTTP against real
+uvicorn workers. Results (throughput and p50/p95/p99 per route) are written
+as JSON and can be compared against a saved baseline.
+
+Needs httpx on top of requirements.txt (pip install httpx).
+
+Usage (from the server directory):
+    python benchmark.py --driver asgi --duration 30 --output bench.json
+    python benchmark.py --driver both --baseline bench.json --threshold 0.2
+    python benchmark.py --seed-only --orders 100000
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+WORKLOAD_MIX = {
+    "public_read": 50,
+    "admin_read": 20,
+    "order_submit": 15,
+    "upload": 5,
+    "login": 10,
+}
+
+ORDER_STATUSES = ["pending", "processing", "completed", "completed", "completed", "cancelled"]
+REQUEST_STATUSES = ["pending", "in_progress", "completed", "rejected"]
+CATEGORIES = ["web", "mobile", "design", "template", "plugin"]
+
+
+# ==================== SEEDING ====================
+
+def _insert_batches(db, model, rows, batch_size=10000):
+    from sqlalchemy import insert
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            db.execute(insert(model), batch)
+            db.commit()
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+        db.commit()
+
+
+def seed(db, products: int, orders: int, contents: int, content_size: int, rng: random.Random):
+    """Top up each table to the requested row count, so a seeded database can be reused."""
+    from models import Product, Order, CustomRequest, PageContent
+    from auth import init_admin
+
+    init_admin(db)
+    now = datetime.utcnow()
+
+    def timestamp():
+        return now - timedelta(seconds=rng.randrange(0, 2 * 365 * 24 * 3600))
+
+    existing = db.query(Product).count()
+    _insert_batches(db, Product, (
+        {
+            "title": f"Product {i}",
+            "description": "Benchmark product " * 20,
+            "price": round(rng.uniform(5, 500), 2),
+            "category": rng.choice(CATEGORIES),
+            "image_url": f"/uploads/product_{i}.png",
+            "features": json.dumps([f"Feature {n}" for n in range(5)]),
+            "is_featured": rng.random() < 0.1,
+            "created_at": timestamp(),
+            "updated_at": now,
+        }
+        for i in range(existing, products)
+    ))
+
+    existing = db.query(Order).count()
+    _insert_batches(db, Order, (
+        {
+            "product_id": rng.randint(1, max(products, 1)),
+            "customer_name": f"Customer {i}",
+            "customer_email": f"customer{i}@example.com",
+            "order_type": rng.choice(["purchase", "customization"]),
+            "customization_details": "Please adjust the colour scheme." if rng.random() < 0.3 else None,
+            "status": rng.choice(ORDER_STATUSES),
+            "total_amount": round(rng.uniform(5, 500), 2),
+            "created_at": timestamp(),
+            "updated_at": timestamp(),
+        }
+        for i in range(existing, orders)
+    ))
+
+    existing = db.query(CustomRequest).count()
+    _insert_batches(db, CustomRequest, (
+        {
+            "customer_name": f"Client {i}",
+            "customer_email": f"client{i}@example.com",
+            "project_title": f"Project {i}",
+            "project_scope": "Build a marketing site with a blog. " * 10,
+            "budget_range": "$1000-$5000",
+            "timeline": "1-2 months",
+            "status": rng.choice(REQUEST_STATUSES),
+            "created_at": timestamp(),
+            "updated_at": timestamp(),
+        }
+        for i in range(existing, orders // 10)
+    ))
+
+    existing = db.query(PageContent).count()
+    _insert_batches(db, PageContent, (
+        {
+            "page_key": f"bench_page_{i}",
+            "content_type": "html",
+            "content": "<p>" + "x" * content_size + "</p>",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(existing, contents)
+    ))
+
+
+# ==================== WORKLOADS ====================
+# Each workload returns (route, method, url, request kwargs).
+
+def public_read(ctx, rng):
+    choice = rng.random()
+    if choice < 0.4:
+        params = {"limit": 20, "skip": rng.randrange(0, max(ctx["products"] - 20, 1))}
+        if rng.random() < 0.3:
+            params["category"] = rng.choice(CATEGORIES)
+        return "GET /api/products", "GET", "/api/products", {"params": params}
+    if choice < 0.8:
+        product_id = rng.randint(1, max(ctx["products"], 1))
+        return "GET /api/products/{product_id}", "GET", f"/api/products/{product_id}", {}
+    page_key = f"bench_page_{rng.randrange(max(ctx['contents'], 1))}"
+    return "GET /api/content/{page_key}", "GET", f"/api/content/{page_key}", {}
+
+
+def admin_read(ctx, rng):
+    headers = {"Authorization": f"Bearer {ctx['token']}"}
+    if rng.random() < 0.7:
+        params = {"limit": 100, "skip": rng.randrange(0, max(ctx["orders"] - 100, 1))}
+        return "GET /api/orders", "GET", "/api/orders", {"params": params, "headers": headers}
+    params = {"limit": 100, "skip": rng.randrange(0, max(ctx["orders"] // 10 - 100, 1))}
+    return "GET /api/custom-requests", "GET", "/api/custom-requests", {"params": params, "headers": headers}
+
+
+def order_submit(ctx, rng):
+    body = {
+        "product_id": rng.randint(1, max(ctx["products"], 1)),
+        "customer_name": "Bench Customer",
+        "customer_email": "bench@example.com",
+        "order_type": "purchase",
+        "total_amount": round(rng.uniform(5, 500), 2),
+    }
+    return "POST /api/orders", "POST", "/api/orders", {"json": body}
+
+
+def upload(ctx, rng):
+    files = {"file": ("bench.bin", ctx["upload_payload"], "application/octet-stream")}
+    headers = {"Authorization": f"Bearer {ctx['token']}"}
+    return "POST /api/upload", "POST", "/api/upload", {"files": files, "headers": headers}
+
+
+def login(ctx, rng):
+    body = {"email": ctx["admin_email"], "password": ctx["admin_password"]}
+    return "POST /api/auth/login", "POST", "/api/auth/login", {"json": body}
+
+
+WORKLOADS = {
+    "public_read": public_read,
+    "admin_read": admin_read,
+    "order_submit": order_submit,
+    "upload": upload,
+    "login": login,
+}
+
+
+# ==================== DRIVING ====================
+
+def percentile(sorted_values, pct: float):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def summarize(latencies, error_latencies, elapsed: float) -> dict:
+    """Per-route stats. Throughput and percentiles only count successful
+    responses; failed requests are reported separately so fast errors
+    cannot hide a regression."""
+    routes = {}
+    for route in sorted(set(latencies) | set(error_latencies)):
+        values = sorted(latencies[route])
+        failed = error_latencies[route]
+        requests = len(values) + len(failed)
+        routes[route] = {
+            "requests": requests,
+            "errors": len(failed),
+            "error_rate": round(len(failed) / requests, 4),
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "mean_ms": _ms(sum(values) / len(values)) if values else None,
+            "p50_ms": _ms(percentile(values, 50)),
+            "p95_ms": _ms(percentile(values, 95)),
+            "p99_ms": _ms(percentile(values, 99)),
+            "error_mean_ms": _ms(sum(failed) / len(failed)) if failed else None,
+        }
+    total = sum(route["requests"] for route in routes.values())
+    errors = sum(route["errors"] for route in routes.values())
+    return {
+        "duration_s": round(elapsed, 2),
+        "total_requests": total,
+        "total_errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": round((total - errors) / elapsed, 2),
+        "routes": routes,
+    }
+
+
+async def drive(client, ctx, mix: dict, concurrency: int, duration: float, seed_value: int) -> dict:
+    import httpx
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies = defaultdict(list)
+    error_latencies = defaultdict(list)
+    deadline = time.perf_counter() + duration
+
+    async def worker(rng):
+        while time.perf_counter() < deadline:
+            workload = rng.choices(names, weights)[0]
+            route, method, url, kwargs = WORKLOADS[workload](ctx, rng)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            elapsed = time.perf_counter() - start
+            (error_latencies if failed else latencies)[route].append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(random.Random(seed_value + n)) for n in range(concurrency)])
+    return summarize(latencies, error_latencies, time.perf_counter() - start)
+
+
+async def fetch_token(client, ctx) -> str:
+    response = await client.post(
+        "/api/auth/login", json={"email": ctx["admin_email"], "password": ctx["admin_password"]}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_asgi(ctx, args) -> dict:
+    import httpx
+    from api.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        ctx["token"] = await fetch_token(client, ctx)
+        report = await drive(client, ctx, args.mix, args.concurrency, args.duration, args.seed)
+    report.update({"driver": "asgi", "concurrency": args.concurrency})
+    return report
+
+
+async def run_uvicorn(ctx, args) -> dict:
+    import httpx
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--host", "127.0.0.1",
+         "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=SERVER_DIR,
+        env=os.environ.copy(),
+    )
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            for _ in range(300):
+                try:
+                    if (await client.get("/api/health")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited before becoming healthy")
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn did not become healthy in time")
+            ctx["token"] = await fetch_token(client, ctx)
+            report = await drive(client, ctx, args.mix, args.concurrency, args.duration, args.seed)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    report.update({"driver": "uvicorn", "concurrency": args.concurrency, "workers": args.workers})
+    return report
+
+
+# ==================== BASELINE COMPARISON ====================
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """Return a list of regressions: p95 latency or error rate up, or
+    throughput down, by more than threshold."""
+    regressions = []
+    for driver, run in results["runs"].items():
+        base_run = baseline.get("runs", {}).get(driver)
+        if not base_run:
+            continue
+        for route, current in run["routes"].items():
+            base = base_run["routes"].get(route)
+            if not base:
+                continue
+            if current["error_rate"] > base["error_rate"] * (1 + threshold):
+                regressions.append(
+                    f"{driver} {route}: errors {base['errors']}/{base['requests']} -> "
+                    f"{current['errors']}/{current['requests']}"
+                )
+            if (current["p95_ms"] is not None and base["p95_ms"] is not None
+                    and current["p95_ms"] > base["p95_ms"] * (1 + threshold)):
+                regressions.append(
+                    f"{driver} {route}: p95 {base['p95_ms']} -> {current['p95_ms']} ms"
+                )
+            if current["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+                regressions.append(
+                    f"{driver} {route}: throughput {base['throughput_rps']} -> {current['throughput_rps']} req/s"
+                )
+    return regressions
+
+
+# ==================== ENTRY POINT ====================
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in WORKLOADS:
+            raise argparse.ArgumentTypeError(f"unknown workload: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Portfolio & Marketplace API")
+    parser.add_argument("--database-url",
+                        default=os.environ.get("BENCH_DATABASE_URL", f"sqlite:///{os.path.join(SERVER_DIR, 'bench.db')}"),
+                        help="database to seed and benchmark (never point this at production)")
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--contents", type=int, default=50, help="page content rows")
+    parser.add_argument("--content-size", type=int, default=20000, help="bytes per page content blob")
+    parser.add_argument("--upload-size", type=int, default=100000, help="bytes per uploaded file")
+    parser.add_argument("--driver", choices=["asgi", "uvicorn", "both"], default="asgi")
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30, help="seconds per driver")
+    parser.add_argument("--mix", type=parse_mix, default=WORKLOAD_MIX,
+                        help="workload weights, e.g. public_read=50,admin_read=20,login=5")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed")
+    parser.add_argument("--seed-only", action="store_true", help="seed the database and exit")
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative regression before flagging (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def absolute_database_url(url: str) -> str:
+    """Resolve a relative SQLite path against the current directory.
+
+    The uvicorn driver runs with cwd=SERVER_DIR, so a relative path would
+    otherwise name a different file in the server than in the seeder.
+    """
+    prefix = "sqlite:///"
+    path = url[len(prefix):] if url.startswith(prefix) else None
+    if not path or path.startswith(":memory:") or os.path.isabs(path):
+        return url
+    return prefix + os.path.abspath(path)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Settings are read at import time, so point them at the benchmark
+    # database and a scratch upload directory before importing the app.
+    # The environment is inherited by the uvicorn driver.
+    os.environ["DATABASE_URL"] = absolute_database_url(args.database_url)
+    sys.path.insert(0, SERVER_DIR)
+    with tempfile.TemporaryDirectory(prefix="bench_uploads_") as upload_dir:
+        os.environ["UPLOAD_DIR"] = upload_dir
+        return run(args)
+
+
+def run(args):
+
+    from database import SessionLocal, engine, Base
+    from config import get_settings
+    import models  # noqa: F401  registers the tables on Base
+
+    settings = get_settings()
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(args.seed)
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        seed(db, args.products, args.orders, args.contents, args.content_size, rng)
+        print(f"Seeded in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    finally:
+        db.close()
+    if args.seed_only:
+        return 0
+
+    ctx = {
+        "products": args.products,
+        "orders": args.orders,
+        "contents": args.contents,
+        "admin_email": settings.admin_email,
+        "admin_password": settings.admin_password,
+        "upload_payload": os.urandom(args.upload_size),
+    }
+    drivers = ["asgi", "uvicorn"] if args.driver == "both" else [args.driver]
+    results = {
+        "created_at": datetime.utcnow().isoformat(),
+        "database": engine.url.get_backend_name(),
+        "volumes": {"products": args.products, "orders": args.orders, "contents": args.contents},
+        "mix": args.mix,
+        "runs": {},
+    }
+    for driver in drivers:
+        runner = run_asgi if driver == "asgi" else run_uvicorn
+        report = asyncio.run(runner(dict(ctx), args))
+        if report["total_errors"]:
+            print(f"WARNING {driver}: {report['total_errors']} of {report['total_requests']} requests failed",
+                  file=sys.stderr)
+        results["runs"][driver] = report
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
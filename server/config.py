@@ -18,7 +18,18 @@ class Settings(BaseSettings):
     # Upload
     upload_dir: str = "uploads"
     max_upload_size: int = 10485760  # 10MB
-    
+
+    # Admin event stream
+    event_queue_size: int = 100  # per connected client
+    event_history_size: int = 1000  # events kept for Last-Event-ID resume
+    event_keepalive_seconds: int = 15
+    event_stream_max_seconds: int = 300  # client reconnects and resumes after this
+    event_token_expire_seconds: int = 60  # stream tokens are only checked on connect
+
+    # Archival of closed orders and custom requests
+    archive_retention_days: int = 90
+    archive_batch_size: int = 500
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import secrets
+from collections import deque
+from typing import List, Optional, Tuple
+from config import get_settings
+
+settings = get_settings()
+
+
+class EventBroadcaster:
+    """In-process fan-out of admin events to connected stream clients.
+
+    Each subscriber gets a bounded queue. A client that falls behind is
+    disconnected instead of buffering without limit; the browser reconnects
+    with Last-Event-ID and catches up from the recent history.
+
+    Event ids are "<boot_token>-<n>". The token is random per process, so an
+    id issued before a restart or by another worker is never mistaken for
+    one of ours; such clients get a resync event instead.
+    """
+
+    def __init__(self, queue_size: int = 100, history_size: int = 1000):
+        self.queue_size = queue_size
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._last_id = 0
+        self.boot_token = secrets.token_hex(8)
+        self.closed = False
+
+    def publish(self, event_type: str, data: dict):
+        self._last_id += 1
+        event = {
+            "id": self._last_id,
+            "event_id": self._event_id(self._last_id),
+            "event": event_type,
+            "data": data,
+        }
+        self._history.append(event)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(queue)
+        return event
+
+    def subscribe(self, last_event_id: Optional[Tuple[str, int]] = None) -> Tuple[asyncio.Queue, List[dict]]:
+        """Register a new client and return its queue plus any missed events."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        backlog = self._replay(last_event_id)
+        if self.closed:
+            queue.put_nowait(None)
+        else:
+            self._subscribers.add(queue)
+        return queue, backlog
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def close(self):
+        """End every open stream, e.g. when the server is shutting down."""
+        self.closed = True
+        for queue in list(self._subscribers):
+            self._drop(queue)
+
+    def _event_id(self, n: int) -> str:
+        return f"{self.boot_token}-{n}"
+
+    def _replay(self, last_event_id: Optional[Tuple[str, int]]) -> List[dict]:
+        if last_event_id is None:
+            return []
+        boot_token, last_id = last_event_id
+        if boot_token == self.boot_token and last_id == self._last_id:
+            return []
+        oldest_id = self._history[0]["id"] if self._history else self._last_id + 1
+        if boot_token != self.boot_token or last_id > self._last_id or last_id < oldest_id - 1:
+            # Unknown id (another process or history rolled over): the client
+            # has to reload its list from the regular endpoints.
+            return [{
+                "id": self._last_id,
+                "event_id": self._event_id(self._last_id),
+                "event": "resync",
+                "data": {},
+            }]
+        return [event for event in self._history if event["id"] > last_id]
+
+    def _drop(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        # None tells the stream to close so the client reconnects and resumes
+        queue.put_nowait(None)
+
+
+def format_sse(event: dict) -> str:
+    """Serialize an event in text/event-stream format."""
+    return f"id: {event['event_id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Split a "<boot_token>-<n>" id; malformed ids map to one that never matches."""
+    if not value:
+        return None
+    boot_token, _, n = value.rpartition("-")
+    if not boot_token or not n.isdigit():
+        return ("", 0)
+    return (boot_token, int(n))
+
+
+def close_on_server_exit(target: EventBroadcaster):
+    """Close all streams as soon as uvicorn receives SIGINT/SIGTERM.
+
+    Uvicorn waits for open connections to finish before it runs the app's
+    shutdown handlers, so an open stream would otherwise block shutdown and
+    every --reload.
+    """
+    try:
+        from uvicorn.server import Server
+    except ImportError:
+        return
+    handle_exit = Server.handle_exit
+    if getattr(handle_exit, "closes_event_streams", False):
+        return
+
+    def handle_exit_and_close(self, sig, frame):
+        target.close()
+        return handle_exit(self, sig, frame)
+
+    handle_exit_and_close.closes_event_streams = True
+    Server.handle_exit = handle_exit_and_close
+
+
+broadcaster = EventBroadcaster(
+    queue_size=settings.event_queue_size,
+    history_size=settings.event_history_size,
+)
+close_on_server_exit(broadcaster)
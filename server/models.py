@@ -25,6 +25,7 @@ class Product(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = {"sqlite_autoincrement": True}  # never reuse ids that moved to the archive
     
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=True)
@@ -43,6 +44,7 @@ class Order(Base):
 
 class CustomRequest(Base):
     __tablename__ = "custom_requests"
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True)
     customer_name = Column(String(255), nullable=False)
@@ -58,6 +60,43 @@ class CustomRequest(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class ArchivedOrder(Base):
+    __tablename__ = "orders_archive"
+    archived = True  # read-only copy, see archive.py
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)  # same id as in orders
+    product_id = Column(Integer, nullable=True)
+    customer_name = Column(String(255), nullable=False)
+    customer_email = Column(String(255), nullable=False)
+    customer_phone = Column(String(50))
+    order_type = Column(String(50))
+    customization_details = Column(Text)
+    status = Column(String(50))
+    total_amount = Column(Float)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ArchivedCustomRequest(Base):
+    __tablename__ = "custom_requests_archive"
+    archived = True
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)  # same id as in custom_requests
+    customer_name = Column(String(255), nullable=False)
+    customer_email = Column(String(255), nullable=False)
+    customer_phone = Column(String(50))
+    project_title = Column(String(255), nullable=False)
+    project_scope = Column(Text, nullable=False)
+    budget_range = Column(String(100))
+    timeline = Column(String(100))
+    additional_details = Column(Text)
+    status = Column(String(50))
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
 class PageContent(Base):
     __tablename__ = "page_contents"
     
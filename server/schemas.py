@@ -57,6 +57,7 @@ class OrderUpdate(BaseModel):
 class Order(OrderBase):
     id: int
     status: str
+    archived: bool = False
     created_at: datetime
     updated_at: datetime
     
@@ -87,6 +88,7 @@ class CustomRequestUpdate(BaseModel):
 class CustomRequest(CustomRequestBase):
     id: int
     status: str
+    archived: bool = False
     created_at: datetime
     updated_at: datetime
     
@@ -124,6 +126,11 @@ class Token(BaseModel):
     token_type: str
 
 
+class EventStreamToken(BaseModel):
+    token: str
+    expires_in: int
+
+
 class TokenData(BaseModel):
     email: Optional[str] = None
 